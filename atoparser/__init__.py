@@ -1,17 +1,24 @@
 """Libraries for reading Atop raw data files."""
 
+from atoparser.layout import read_field
+from atoparser.layout import struct_columns
+from atoparser.layout import struct_fields
+from atoparser.layout import struct_format
 from atoparser.utils import CGChainer
 from atoparser.utils import CStat
 from atoparser.utils import Header
+from atoparser.utils import MappedFile
 from atoparser.utils import Record
 from atoparser.utils import SStat
 from atoparser.utils import TStat
 from atoparser.utils import generate_statistics
+from atoparser.utils import generate_statistics_batched
 from atoparser.utils import get_cstat
 from atoparser.utils import get_header
 from atoparser.utils import get_record
 from atoparser.utils import get_sstat
 from atoparser.utils import get_tstat
 from atoparser.utils import struct_to_dict
+from atoparser.utils import struct_to_namedtuple
 
 __version__ = "3.3.0"
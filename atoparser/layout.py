@@ -0,0 +1,355 @@
+"""Helpers to read C struct layouts directly from raw bytes, without creating C structs.
+
+Every struct type is described with precompiled struct module formats, which are created once per struct type and
+reused. This allows reading single fields, flat rows, or columns of fields from many structs, with a single call
+into C per buffer, instead of creating a Python object per struct and accessing each field through ctypes.
+"""
+
+from __future__ import annotations
+
+import array
+import ctypes
+import struct
+from struct import Struct
+from typing import Callable
+from typing import Iterator
+
+# Precompiled unpackers for every struct type and field combination extracted as columns.
+_COLUMN_UNPACKERS: dict[
+    tuple[type, tuple[str, ...]],
+    tuple[Struct, tuple[str, ...], tuple[str, ...], tuple[str, ...]],
+] = {}
+# Precompiled formats matching the full memory layout of every struct type unpacked without ctypes.
+_STRUCT_FORMATS: dict[tuple[type, bool], Struct] = {}
+_STRUCT_FIELDS: dict[tuple[type, bool], tuple[str, ...]] = {}
+# Precompiled readers for every struct type and field read directly from raw bytes.
+_FIELD_READERS: dict[tuple[type, str], tuple[Callable, int, bool]] = {}
+# Struct module format codes that have a typed array equivalent with the same size, for columns stored as arrays.
+_ARRAY_TYPECODES = {code for code in "bBhHiIqQfd" if array.array(code).itemsize == Struct(f"={code}").size}
+# Fixed size struct module formats for ctypes integers, by byte length and whether the type is unsigned.
+_INT_FORMATS = {(1, False): "b", (1, True): "B", (2, False): "h", (2, True): "H", (4, False): "i", (4, True): "I"}
+_INT_FORMATS.update({(8, False): "q", (8, True): "Q"})
+
+
+def is_future_field(field: tuple) -> bool:
+    """Check if a struct field is a "future" field, an empty placeholder for potential future versions.
+
+    Args:
+        field: Entry from the struct's "_fields_", with the field name first.
+
+    Returns:
+        True if the field is not a nested struct and is named as a future placeholder.
+    """
+    field_type = getattr(field[1], "__origin__", field[1])
+    return "future" in field[0] and not issubclass(field_type, ctypes.Structure)
+
+
+def format_code(field_type: type) -> str | None:
+    """Get the fixed size struct module format code matching a scalar or character array C type.
+
+    Args:
+        field_type: C type of a single struct field.
+
+    Returns:
+        The format code, or None if the type cannot be represented as a single struct module field.
+    """
+    if field_type is ctypes.c_char:
+        return "c"
+    if issubclass(field_type, ctypes.Array):
+        # pylint: disable-next=protected-access
+        return f"{field_type._length_}s" if field_type._type_ is ctypes.c_char else None
+    code = getattr(field_type, "_type_", None)
+    if not isinstance(code, str) or issubclass(field_type, ctypes.Structure):
+        return None
+    if code in "bBhHiIlLqQ":
+        code = _INT_FORMATS.get((ctypes.sizeof(field_type), code.isupper()))
+    if code is None:
+        return None
+    try:
+        size = Struct(f"={code}").size
+    except struct.error:
+        # Pointers, wide characters, and long doubles have no fixed size equivalent in the struct module.
+        return None
+    return code if size == ctypes.sizeof(field_type) else None
+
+
+def _padded_format(entries: list[tuple[int, str, int]], size: int) -> str:
+    """Join the format codes of fields at known offsets into a single format, padding the gaps between them.
+
+    Args:
+        entries: Byte offset, struct module format, and byte size of every field to read, in offset order.
+        size: Total byte length of the format, to pad after the final field.
+
+    Returns:
+        The format, without a byte order prefix.
+
+    Raises:
+        ValueError if any fields overlap.
+    """
+    fmt = []
+    position = 0
+    for offset, code, field_size in entries:
+        if offset < position:
+            raise ValueError(f"Overlapping fields cannot be represented at offset {offset}")
+        if offset > position:
+            fmt.append(f"{offset - position}x")
+        fmt.append(code)
+        position = offset + field_size
+    if position < size:
+        fmt.append(f"{size - position}x")
+    return "".join(fmt)
+
+
+def _layout_format(field_type: type, skip_future: bool = False) -> str:
+    """Get the fixed size struct module format matching the full memory layout of a C type.
+
+    Args:
+        field_type: C scalar, array, or struct type.
+        skip_future: Whether to read "future" fields in structs as padding, instead of values.
+
+    Returns:
+        The format, with nested structs inlined, arrays expanded, and padding included.
+
+    Raises:
+        ValueError if the type contains fields that cannot be represented, such as bit fields or unions.
+    """
+    code = format_code(field_type)
+    if code is not None:
+        return code
+    if issubclass(field_type, ctypes.Array):
+        # pylint: disable-next=protected-access
+        element_type, length = field_type._type_, field_type._length_
+        element_code = format_code(element_type)
+        if element_code is not None:
+            return f"{length}{element_code}"
+        return _layout_format(element_type, skip_future) * length
+    if not issubclass(field_type, ctypes.Structure):
+        raise ValueError(f"Type cannot be represented as a struct format: {field_type.__name__}")
+
+    entries = []
+    for field in field_type._fields_:  # pylint: disable=protected-access
+        descriptor = getattr(field_type, field[0])
+        if len(field) > 2:
+            raise ValueError(f"Bit fields cannot be represented: {field_type.__name__}")
+        if skip_future and is_future_field(field):
+            code = f"{descriptor.size}x"
+        else:
+            code = _layout_format(field[1], skip_future)
+        entries.append((descriptor.offset, code, descriptor.size))
+    return _padded_format(entries, ctypes.sizeof(field_type))
+
+
+def struct_format(struct_type: type, skip_future: bool = False) -> Struct:
+    """Get a precompiled struct module format matching the full memory layout of a C struct type.
+
+    Allows reading values directly from raw or decompressed bytes with unpack_from(buffer, offset), without creating
+    a C struct. Nested structs and arrays are flattened into the values in field order.
+
+    Args:
+        struct_type: C struct class, such as header.TStat.
+        skip_future: Whether to skip over "future" fields, which are empty placeholders, instead of unpacking them.
+            Reduces the amount of values created per struct, while keeping the same size as the C struct.
+
+    Returns:
+        The compiled format, with the same size as the C struct.
+
+    Raises:
+        ValueError if the type contains fields that cannot be represented, such as bit fields or unions.
+    """
+    key = (struct_type, skip_future)
+    compiled = _STRUCT_FORMATS.get(key)
+    if compiled is None:
+        compiled = _STRUCT_FORMATS[key] = Struct(f"={_layout_format(struct_type, skip_future)}")
+    return compiled
+
+
+def _layout_names(field_type: type, prefix: str, skip_future: bool = False) -> Iterator[str]:
+    """Generate the flattened name of every value unpacked with the full memory layout format of a C type.
+
+    Args:
+        field_type: C scalar, array, or struct type.
+        prefix: Name of the field containing the type.
+        skip_future: Whether "future" fields in structs are read as padding, instead of values.
+
+    Yields:
+        Dotted field names, with array entries named by their index, in the same order as the unpacked values.
+    """
+    if format_code(field_type) is not None:
+        yield prefix
+    elif issubclass(field_type, ctypes.Array):
+        for index in range(field_type._length_):  # pylint: disable=protected-access
+            # pylint: disable-next=protected-access
+            yield from _layout_names(field_type._type_, f"{prefix}.{index}", skip_future)
+    else:
+        for field in field_type._fields_:  # pylint: disable=protected-access
+            if not (skip_future and is_future_field(field)):
+                yield from _layout_names(field[1], f"{prefix}.{field[0]}" if prefix else field[0], skip_future)
+
+
+def struct_fields(struct_type: type, skip_future: bool = False) -> tuple[str, ...]:
+    """Get the flattened names of every value unpacked with the struct_format of a C struct type.
+
+    Combine with struct_format to convert raw bytes into flat rows, such as for CSV output, without creating a struct:
+    dict(zip(struct_fields(struct_type), struct_format(struct_type).unpack_from(buffer)))
+
+    Args:
+        struct_type: C struct class, such as header.TStat.
+        skip_future: Whether to match a struct_format that skips over "future" fields.
+
+    Returns:
+        Dotted field names, e.g. "gen.pid" or "cpu.cpu.0.stime", in the same order as the unpacked values.
+
+    Raises:
+        ValueError if the type contains fields that cannot be represented, such as bit fields or unions.
+    """
+    key = (struct_type, skip_future)
+    names = _STRUCT_FIELDS.get(key)
+    if names is None:
+        # Validate the layout can be represented before naming it, to ensure the names always match the format.
+        struct_format(struct_type, skip_future)
+        names = _STRUCT_FIELDS[key] = tuple(_layout_names(struct_type, "", skip_future))
+    return names
+
+
+def _resolve_field(struct_type: type, path: str) -> tuple[int, str, int]:
+    """Find the location and format of a scalar or character array field within a struct type.
+
+    Args:
+        struct_type: C struct class to inspect.
+        path: Name of the field. Nested fields use dots to separate names, e.g. "gen.pid".
+
+    Returns:
+        The byte offset of the field from the start of the struct, the struct module format code, and the byte size.
+
+    Raises:
+        ValueError if the field does not exist, or is not a scalar or character array.
+    """
+    field_type = struct_type
+    offset = 0
+    for field_name in path.split("."):
+        field = None
+        if isinstance(field_type, type) and issubclass(field_type, ctypes.Structure):
+            # pylint: disable-next=protected-access
+            field = next((field for field in field_type._fields_ if field[0] == field_name), None)
+        if field is None or len(field) > 2:
+            raise ValueError(f"Field is not available: {path}")
+        offset += getattr(field_type, field_name).offset
+        field_type = field[1]
+    code = format_code(field_type)
+    if code is None:
+        raise ValueError(f"Field is not a scalar or character array: {path}")
+    return offset, code, ctypes.sizeof(field_type)
+
+
+def read_field(struct_type: type, buffer: bytes | memoryview, field: str, offset: int = 0) -> object:
+    """Read a single field of a struct directly from raw bytes, without creating the struct.
+
+    The location of every field is only calculated once per struct type. Useful when only a few fields are needed
+    from a large struct, such as reading a handful of values from decompressed SStat bytes.
+
+    Args:
+        struct_type: C struct class describing the layout of the bytes, such as header.SStat.
+        buffer: Bytes containing the struct.
+        field: Name of a scalar or character array field. Nested fields use dots, e.g. "mem.physmem".
+        offset: Byte offset of the struct within the buffer.
+
+    Returns:
+        The value of the field. Characters are decoded to strings ending at the first null character.
+
+    Raises:
+        ValueError if the field does not exist, or is not a scalar or character array.
+    """
+    key = (struct_type, field)
+    reader = _FIELD_READERS.get(key)
+    if reader is None:
+        field_offset, code, _ = _resolve_field(struct_type, field)
+        reader = _FIELD_READERS[key] = (Struct(f"={code}").unpack_from, field_offset, code[-1] in "cs")
+    unpack_from, field_offset, is_string = reader
+    value = unpack_from(buffer, offset + field_offset)[0]
+    if is_string:
+        # Match ctypes character arrays, which end at the first null character.
+        value = value.split(b"\0", 1)[0].decode(errors="ignore")
+    return value
+
+
+def _build_column_unpacker(
+    struct_type: type,
+    fields: tuple[str, ...],
+) -> tuple[Struct, tuple[str, ...], tuple[str, ...], tuple[str, ...]]:
+    """Precompile a single unpack of the requested fields from a struct type, skipping all other bytes.
+
+    Args:
+        struct_type: C struct class to inspect.
+        fields: Names of the fields to unpack. Nested fields use dots to separate names.
+
+    Returns:
+        The struct format covering the full struct length, the names of the fields in unpacked order, the names
+        of the character fields to decode, and the format code of every field in unpacked order.
+
+    Raises:
+        ValueError if a field does not exist, or is not a scalar or character array.
+    """
+    resolved = sorted((*_resolve_field(struct_type, path), path) for path in dict.fromkeys(fields))
+    # Pad to the full struct length so that every unpack starts at the next struct in the array.
+    fmt = _padded_format([entry[:3] for entry in resolved], ctypes.sizeof(struct_type))
+    names = tuple(entry[3] for entry in resolved)
+    codes = tuple(entry[1] for entry in resolved)
+    strings = tuple(path for _, code, _, path in resolved if code[-1] in "cs")
+    return Struct(f"={fmt}"), names, strings, codes
+
+
+def struct_columns(
+    structs: ctypes.Array | list[ctypes.Structure],
+    fields: list[str],
+    as_arrays: bool = False,
+    count: int | None = None,
+) -> dict[str, list | array.array]:
+    """Extract fields from every struct in an array or list as columns of values.
+
+    All requested fields are read from every struct with a single precompiled unpack over the structs' memory, instead
+    of accessing each field through ctypes. Arrays are read in place, lists are first joined into a single buffer.
+
+    Args:
+        structs: Array or list of C structs of the same type, such as the TStats returned by get_tstat.
+        fields: Names of scalar or character array fields to extract. Nested fields use dots, e.g. "gen.pid".
+        as_arrays: Return numeric columns as typed arrays instead of lists. Typed arrays store values contiguously
+            as C values, reducing memory use and improving locality when repeatedly scanning only a few columns.
+        count: Only extract from the first structs in the array, such as the valid entries of a fixed size array.
+            For example, struct_columns(sstat.cpu.cpu, ["stime"], count=sstat.cpu.nrcpu).
+
+    Returns:
+        Lists of values, with one value per struct, by field name. Characters are decoded to strings ending at the
+        first null character. Empty lists of structs always return lists, since the struct type is unknown.
+
+    Raises:
+        ValueError if a field does not exist, or is not a scalar or character array.
+    """
+    if isinstance(structs, ctypes.Array):
+        struct_type = structs._type_  # pylint: disable=protected-access
+    elif structs:
+        struct_type = type(structs[0])
+        # Join the memory of every struct in one pass, to unpack them all at once like an array.
+        structs = b"".join(structs)
+    else:
+        return {field_name: [] for field_name in fields}
+    key = (struct_type, tuple(fields))
+    unpacker = _COLUMN_UNPACKERS.get(key)
+    if unpacker is None:
+        unpacker = _COLUMN_UNPACKERS[key] = _build_column_unpacker(*key)
+    compiled, names, strings, codes = unpacker
+
+    columns = dict.fromkeys(names, ())
+    buffer = structs
+    if count is not None:
+        # Slice the raw memory rather than the array, to avoid creating a Python object per struct.
+        buffer = memoryview(structs).cast("B")[: max(count, 0) * compiled.size]
+    columns.update(zip(names, zip(*compiled.iter_unpack(buffer))))
+    for field_name in strings:
+        # Match ctypes character arrays, which end at the first null character.
+        columns[field_name] = [value.split(b"\0", 1)[0].decode(errors="ignore") for value in columns[field_name]]
+    for field_name, code in zip(names, codes):
+        if as_arrays and code in _ARRAY_TYPECODES:
+            columns[field_name] = array.array(code, columns[field_name])
+        elif not isinstance(columns[field_name], list):
+            columns[field_name] = list(columns[field_name])
+    return {field_name: columns[field_name] for field_name in fields}
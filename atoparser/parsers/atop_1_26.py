@@ -15,10 +15,8 @@ def parse_cpu(
     tstats: list[utils.TStat],
 ) -> dict:
     """Retrieves statistics for Atop 'cpu' parseable representing per core usage."""
-    for index, cpu in enumerate(sstat.cpu.cpu):
-        if index >= sstat.cpu.nrcpu:
-            # Core list contains 100 entries, but only up the count specified in the cpu stat are valid.
-            break
+    # Core list contains 100 entries, but only up the count specified in the cpu stat are valid.
+    for index, cpu in enumerate(sstat.cpu.cpu_valid):
         values = {
             "timestamp": record.curtime,
             "interval": record.interval,
@@ -250,21 +248,24 @@ def parse_PRC(
 ) -> dict:
     """Retrieves statistics for Atop 'PRC' parseable representing process cpu usage."""
     for stat in tstats:
+        # Access nested structs once per process, since every access through the parent creates a new struct object.
+        gen = stat.gen
+        cpu = stat.cpu
         values = {
             "timestamp": record.curtime,
             "interval": record.interval,
-            "pid": stat.gen.pid,
-            "name": stat.gen.name.decode(),
-            "state": stat.gen.state.decode(),
+            "pid": gen.pid,
+            "name": gen.name.decode(),
+            "state": gen.state.decode(),
             "ticks": header.hertz,
-            "user_consumption": stat.cpu.utime,
-            "system_consumption": stat.cpu.stime,
-            "nice": stat.cpu.nice,
-            "priority": stat.cpu.prio,
-            "priority_realtime": stat.cpu.rtprio,
-            "policy": stat.cpu.policy,
-            "cpu": stat.cpu.curcpu,
-            "sleep": stat.cpu.sleepavg,
+            "user_consumption": cpu.utime,
+            "system_consumption": cpu.stime,
+            "nice": cpu.nice,
+            "priority": cpu.prio,
+            "priority_realtime": cpu.rtprio,
+            "policy": cpu.policy,
+            "cpu": cpu.curcpu,
+            "sleep": cpu.sleepavg,
         }
         yield values
 
@@ -277,19 +278,21 @@ def parse_PRD(
 ) -> dict:
     """Retrieves statistics for Atop 'PRD' parseable representing process drive usage."""
     for stat in tstats:
+        gen = stat.gen
+        dsk = stat.dsk
         values = {
             "timestamp": record.curtime,
             "interval": record.interval,
-            "pid": stat.gen.pid,
-            "name": stat.gen.name.decode(),
-            "state": stat.gen.state.decode(),
+            "pid": gen.pid,
+            "name": gen.name.decode(),
+            "state": gen.state.decode(),
             "kernel_patch": "y" if header.supportflags & atop_1_26.PATCHSTAT else "n",
             "standard_io": "y" if header.supportflags & atop_1_26.IOSTAT else "n",
-            "reads": stat.dsk.rio,
-            "read_sectors": stat.dsk.rsz,
-            "writes": stat.dsk.wio,
-            "written_sectors": stat.dsk.wsz,
-            "cancelled_sector_writes": stat.dsk.cwsz,
+            "reads": dsk.rio,
+            "read_sectors": dsk.rsz,
+            "writes": dsk.wio,
+            "written_sectors": dsk.wsz,
+            "cancelled_sector_writes": dsk.cwsz,
         }
         yield values
 
@@ -302,30 +305,31 @@ def parse_PRG(
 ) -> dict:
     """Retrieves statistics for Atop 'PRG' parseable representing process generic details."""
     for stat in tstats:
+        gen = stat.gen
         values = {
             "timestamp": record.curtime,
             "interval": record.interval,
-            "pid": stat.gen.pid,
-            "name": stat.gen.name.decode(),
-            "state": stat.gen.state.decode(),
-            "real_uid": stat.gen.ruid,
-            "real_gid": stat.gen.rgid,
-            "tgid": stat.gen.pid,  # This is a duplicate of pid per atop documentation.
-            "threads": stat.gen.nthr,
-            "exit_code": stat.gen.excode,
-            "start_time": stat.gen.btime,
-            "cmd": stat.gen.cmdline.decode(),
-            "ppid": stat.gen.ppid,
-            "running_threads": stat.gen.nthrrun,
-            "sleeping_threads": stat.gen.nthrslpi,
-            "dead_threads": stat.gen.nthrslpu,
-            "effective_uid": stat.gen.euid,
-            "effective_gid": stat.gen.egid,
-            "saved_uid": stat.gen.suid,
-            "saved_gid": stat.gen.sgid,
-            "filesystem_uid": stat.gen.fsuid,
-            "filesystem_gid": stat.gen.fsgid,
-            "elapsed_time": stat.gen.elaps,
+            "pid": gen.pid,
+            "name": gen.name.decode(),
+            "state": gen.state.decode(),
+            "real_uid": gen.ruid,
+            "real_gid": gen.rgid,
+            "tgid": gen.pid,  # This is a duplicate of pid per atop documentation.
+            "threads": gen.nthr,
+            "exit_code": gen.excode,
+            "start_time": gen.btime,
+            "cmd": gen.cmdline.decode(),
+            "ppid": gen.ppid,
+            "running_threads": gen.nthrrun,
+            "sleeping_threads": gen.nthrslpi,
+            "dead_threads": gen.nthrslpu,
+            "effective_uid": gen.euid,
+            "effective_gid": gen.egid,
+            "saved_uid": gen.suid,
+            "saved_gid": gen.sgid,
+            "filesystem_uid": gen.fsuid,
+            "filesystem_gid": gen.fsgid,
+            "elapsed_time": gen.elaps,
         }
         yield values
 
@@ -338,20 +342,22 @@ def parse_PRM(
 ) -> dict:
     """Retrieves statistics for Atop 'PRM' parseable representing process memory usage."""
     for stat in tstats:
+        gen = stat.gen
+        mem = stat.mem
         values = {
             "timestamp": record.curtime,
             "interval": record.interval,
-            "pid": stat.gen.pid,
-            "name": stat.gen.name.decode(),
-            "state": stat.gen.state.decode(),
+            "pid": gen.pid,
+            "name": gen.name.decode(),
+            "state": gen.state.decode(),
             "page": header.pagesize,
-            "vsize": stat.mem.vmem * 1024,
-            "rsize": stat.mem.rmem * 1024,
-            "ssize": stat.mem.shtext * 1024,
-            "vgrowth": stat.mem.vgrow * 1024,
-            "rgrowth": stat.mem.rgrow * 1024,
-            "minor_faults": stat.mem.minflt,
-            "major_faults": stat.mem.majflt,
+            "vsize": mem.vmem * 1024,
+            "rsize": mem.rmem * 1024,
+            "ssize": mem.shtext * 1024,
+            "vgrowth": mem.vgrow * 1024,
+            "rgrowth": mem.rgrow * 1024,
+            "minor_faults": mem.minflt,
+            "major_faults": mem.majflt,
         }
         yield values
 
@@ -364,23 +370,25 @@ def parse_PRN(
 ) -> dict:
     """Retrieves statistics for Atop 'PRN' parseable representing process network activity."""
     for stat in tstats:
+        gen = stat.gen
+        net = stat.net
         values = {
             "timestamp": record.curtime,
             "interval": record.interval,
-            "pid": stat.gen.pid,
-            "name": stat.gen.name.decode(),
-            "state": stat.gen.state.decode(),
+            "pid": gen.pid,
+            "name": gen.name.decode(),
+            "state": gen.state.decode(),
             "kernel_patch": "y" if header.supportflags & atop_1_26.PATCHSTAT else "n",
-            "tcp_transmitted": stat.net.tcpsnd,
-            "tcp_transmitted_size": stat.net.tcpssz,
-            "tcp_received": stat.net.tcprcv,
-            "tcp_received_size": stat.net.tcprsz,
-            "udp_transmitted": stat.net.udpsnd,
-            "udp_transmitted_size": stat.net.udpssz,
-            "udp_received": stat.net.udprcv,
-            "udp_received_size": stat.net.udprsz,
-            "raw_transmitted": stat.net.rawsnd,
-            "raw_received": stat.net.rawrcv,
+            "tcp_transmitted": net.tcpsnd,
+            "tcp_transmitted_size": net.tcpssz,
+            "tcp_received": net.tcprcv,
+            "tcp_received_size": net.tcprsz,
+            "udp_transmitted": net.udpsnd,
+            "udp_transmitted_size": net.udpssz,
+            "udp_received": net.udprcv,
+            "udp_received_size": net.udprsz,
+            "raw_transmitted": net.rawsnd,
+            "raw_received": net.rawrcv,
         }
         yield values
 
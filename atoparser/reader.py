@@ -3,12 +3,30 @@
 """Simple Atop log processor."""
 
 import argparse
+import collections
+import ctypes
+import functools
 import gzip
+import io
 import json
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
+from typing import Callable
+from typing import Iterable
+from typing import Iterator
 
 import atoparser
 from atoparser.parsers import atop_1_26
 
+try:
+    # orjson provides a drop-in accelerated JSON serializer when available. Fallback to the standard library if not.
+    import orjson
+except ImportError:
+    orjson = None
+
+READ_BUFFER_SIZE = 128 * 1024
 PARSEABLES = ["cpu", "CPL", "CPU", "DSK", "LVM", "MDD", "MEM", "NETL", "NETU", "PAG", "PRC", "PRG", "PRM", "PRN", "SWP"]
 PARSEABLE_MAP = {
     "1.26": {parseable: getattr(atop_1_26, f"parse_{parseable}") for parseable in PARSEABLES},
@@ -27,7 +45,7 @@ def parse_args() -> argparse.Namespace:
     parser.add_argument(
         "files",
         nargs="+",
-        help="Files to process. May be uncompressed or gzip compressed.",
+        help='Files to process. May be uncompressed or gzip compressed with a ".gz" suffix.',
     )
     parser.add_argument(
         "-P",
@@ -53,50 +71,257 @@ def parse_args() -> argparse.Namespace:
         action="store_true",
         help="Include CGroup/CStats in output. Only available with Atop 2.11+ logs. Verbose.",
     )
+    parser.add_argument(
+        "--jsonl",
+        action="store_true",
+        help="Output every sample as a separate JSON line, instead of a JSON array per file. Ignores pretty printing.",
+    )
+    parser.add_argument(
+        "-w",
+        "--workers",
+        type=int,
+        default=os.cpu_count() or 1,
+        help="Maximum number of files to process in parallel. Defaults to the number of CPUs.",
+    )
     args = parser.parse_args()
     return args
 
 
+def _open_log(file: str) -> io.BufferedIOBase | atoparser.MappedFile:
+    """Open an Atop log for reading, using a memory mapped file when uncompressed.
+
+    Args:
+        file: Path to the file to open. May be uncompressed or gzip compressed.
+
+    Returns:
+        An open file like object capable of reading as bytes.
+    """
+    if file.endswith(".gz"):
+        # Use a larger buffer than the default to reduce the amount of small reads through the decompressor.
+        return io.BufferedReader(gzip.GzipFile(file, "rb"), buffer_size=READ_BUFFER_SIZE)
+    try:
+        return atoparser.MappedFile(file)
+    except (OSError, ValueError):
+        # Files that cannot be mapped, such as pipes or empty files, must be read normally.
+        return open(file, "rb", buffering=READ_BUFFER_SIZE)  # pylint: disable=consider-using-with
+
+
+def _parse_sample(
+    parsers: dict[str, Callable],
+    parseables: list[str],
+    header: atoparser.Header,
+    statistics: tuple[atoparser.Record, atoparser.SStat, list[atoparser.TStat], list[atoparser.CGChainer]],
+) -> Iterator[dict]:
+    """Convert a single sample into Atop "parseable" formats.
+
+    Args:
+        parsers: Parse functions for the file's Atop version, by parseable name.
+        parseables: Atop "parseable" formats to output.
+        header: The header from the file containing the sample.
+        statistics: The record, sstat, tstats, and cgroups of the sample, as read by generate_statistics.
+
+    Yields:
+        Every result from every requested parseable, in order.
+    """
+    record, sstat, tstats, _ = statistics
+    for parseable in parseables:
+        for sample in parsers[parseable](header, record, sstat, tstats):
+            sample["parseable"] = parseable
+            yield sample
+
+
+def iter_samples(
+    file: str,
+    parseables: list[str] | None = None,
+    include_tstats: bool = False,
+    include_cstats: bool = False,
+    convert_stats: bool = True,
+) -> Iterator[dict]:
+    """Convert a single Atop log file into JSON compatible samples, one at a time.
+
+    Args:
+        file: Path to the file to process. May be uncompressed or gzip compressed.
+        parseables: Atop "parseable" formats to output, instead of full structs.
+        include_tstats: Include TStats/PStats in the full struct output.
+        include_cstats: Include CGroup/CStats in the full struct output.
+        convert_stats: Convert TStats/PStats and CGroup/CStats into dictionaries. If False, the original structs are
+            included, and must be serialized with a default handler such as the one used by the reader output.
+
+    Yields:
+        Every sample read from the file in the requested format.
+    """
+    with _open_log(file) as raw_file:
+        header = atoparser.get_header(raw_file)
+        if parseables and header.semantic_version not in PARSEABLE_MAP:
+            yield {
+                "error": f"Atop version {header.semantic_version} does not support parseables, only full raw output.",
+                "file": file,
+            }
+            return
+        parsers = PARSEABLE_MAP.get(header.semantic_version, PARSEABLE_MAP["1.26"])
+        # The header is the same for every sample, only convert it once and share it across all samples.
+        header_dict = atoparser.struct_to_dict(header) if not parseables else None
+        for statistics in atoparser.generate_statistics(raw_file, header, raise_on_truncation=False):
+            if parseables:
+                yield from _parse_sample(parsers, parseables, header, statistics)
+            else:
+                record, sstat, tstats, cgroups = statistics
+                converted = {
+                    "header": header_dict,
+                    "record": atoparser.struct_to_dict(record),
+                    "sstat": atoparser.struct_to_dict(sstat),
+                }
+                if include_tstats:
+                    converted["tstat"] = (
+                        [atoparser.struct_to_dict(stat) for stat in tstats] if convert_stats else tstats
+                    )
+                if include_cstats:
+                    converted["cgroup"] = (
+                        [atoparser.struct_to_dict(stat) for stat in cgroups] if convert_stats else cgroups
+                    )
+                yield converted
+
+
+def _ctypes_default(value: object) -> object:
+    """Convert C structs and arrays into JSON compatible values as they are serialized.
+
+    Allows structs to be converted one at a time during serialization, instead of converting all structs up front.
+
+    Args:
+        value: Object that could not be serialized natively.
+
+    Returns:
+        C arrays as lists, and C structs, or C struct like objects, as dictionaries.
+
+    Raises:
+        TypeError if the value is not a C array or struct.
+    """
+    if isinstance(value, ctypes.Array):
+        return list(value)
+    if hasattr(value, "_fields_"):
+        return atoparser.struct_to_dict(value)
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def _dumps(value: object, pretty_print: bool = False) -> bytes:
+    """Serialize a value to JSON bytes.
+
+    Args:
+        value: JSON compatible object to serialize.
+        pretty_print: Whether to indent the output.
+
+    Returns:
+        The value serialized as JSON.
+    """
+    if orjson is not None:
+        return orjson.dumps(value, default=_ctypes_default, option=orjson.OPT_INDENT_2 if pretty_print else 0)
+    return json.dumps(value, default=_ctypes_default, indent=2 if pretty_print else None).encode()
+
+
+def _write_samples(
+    samples: Iterable[dict],
+    output: io.BufferedIOBase,
+    pretty_print: bool = False,
+    jsonl: bool = False,
+) -> None:
+    """Serialize samples to JSON and write them to an output as they are received, instead of all at once.
+
+    Args:
+        samples: JSON compatible samples to write.
+        output: Binary stream to write the serialized samples to.
+        pretty_print: Whether to indent the output. Ignored if using JSON lines.
+        jsonl: Whether to write every sample as a separate JSON line, instead of a single JSON array.
+    """
+    if jsonl:
+        for sample in samples:
+            output.write(_dumps(sample))
+            output.write(b"\n")
+        return
+
+    # Match the layout of serializing the full array at once, so output is consistent regardless of streaming.
+    if pretty_print:
+        separator = b",\n"
+    else:
+        separator = b"," if orjson is not None else b", "
+    output.write(b"[")
+    written = False
+    for sample in samples:
+        if written:
+            output.write(separator)
+        elif pretty_print:
+            output.write(b"\n")
+        serialized = _dumps(sample, pretty_print)
+        if pretty_print:
+            # Indent the sample one level to nest it within the array.
+            serialized = b"\n".join(b"  " + line for line in serialized.split(b"\n"))
+        output.write(serialized)
+        written = True
+    if written and pretty_print:
+        output.write(b"\n")
+    output.write(b"]\n")
+
+
+def _render_file(
+    file: str,
+    parseables: list[str] | None,
+    include_tstats: bool,
+    include_cstats: bool,
+    *,
+    pretty_print: bool = False,
+    jsonl: bool = False,
+) -> bytes:
+    """Convert a single Atop log file into serialized JSON output.
+
+    Used by parallel workers to return a single bytes object, which is much cheaper to send back to the main process
+    than pickling and unpickling every converted sample.
+
+    Args:
+        file: Path to the file to process. May be uncompressed or gzip compressed.
+        parseables: Atop "parseable" formats to output, instead of full structs.
+        include_tstats: Include TStats/PStats in the full struct output.
+        include_cstats: Include CGroup/CStats in the full struct output.
+        pretty_print: Whether to indent the output. Ignored if using JSON lines.
+        jsonl: Whether to write every sample as a separate JSON line, instead of a single JSON array.
+
+    Returns:
+        The serialized output for all samples in the file.
+    """
+    output = io.BytesIO()
+    samples = iter_samples(file, parseables, include_tstats, include_cstats, convert_stats=False)
+    _write_samples(samples, output, pretty_print, jsonl)
+    return output.getvalue()
+
+
 def main() -> None:
     """Primary function to load Atop data."""
     args = parse_args()
 
-    for file in args.files:
-        samples = []
-        opener = open if ".gz" not in file else gzip.open
-        with opener(file, "rb") as raw_file:
-            header = atoparser.get_header(raw_file)
-            if args.parseables and header.semantic_version not in PARSEABLE_MAP:
-                samples.append(
-                    {
-                        "error": f"Atop version {header.semantic_version} does not support parseables, only full raw output.",
-                        "file": file,
-                    }
-                )
-                continue
-            parsers = PARSEABLE_MAP.get(header.semantic_version, PARSEABLE_MAP["1.26"])
-            for record, sstat, tstats, cgroups in atoparser.generate_statistics(
-                raw_file,
-                header,
-                raise_on_truncation=False,
-            ):
-                if args.parseables:
-                    for parseable in args.parseables:
-                        for sample in parsers[parseable](header, record, sstat, tstats):
-                            sample["parseable"] = parseable
-                            samples.append(sample)
-                else:
-                    converted = {
-                        "header": atoparser.struct_to_dict(header),
-                        "record": atoparser.struct_to_dict(record),
-                        "sstat": atoparser.struct_to_dict(sstat),
-                    }
-                    if args.tstats:
-                        converted["tstat"] = [atoparser.struct_to_dict(stat) for stat in tstats]
-                    if args.cstats:
-                        converted["cgroup"] = [atoparser.struct_to_dict(stat) for stat in cgroups]
-                    samples.append(converted)
-        print(json.dumps(samples, indent=2 if args.pretty_print else None))
+    # Files are independent and parsing is CPU bound, so process them in parallel across multiple processes.
+    # Results are returned in the original order to keep output consistent regardless of the amount of workers.
+    workers = min(args.workers, len(args.files))
+    file_args = (
+        args.files,
+        repeat(args.parseables),
+        repeat(args.tstats),
+        repeat(args.cstats),
+    )
+    output = sys.stdout.buffer
+    if workers > 1:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            render = functools.partial(_render_file, pretty_print=args.pretty_print, jsonl=args.jsonl)
+            # Only submit one file per worker at a time, so rendered files are not held while earlier files finish.
+            pending = collections.deque()
+            for render_args in zip(*file_args):
+                if len(pending) >= workers:
+                    output.write(pending.popleft().result())
+                pending.append(executor.submit(render, *render_args))
+            while pending:
+                output.write(pending.popleft().result())
+    else:
+        # Stream samples directly to the output to avoid holding every sample from a file in memory at once.
+        # Structs are converted as they are serialized, to avoid building every converted struct in a sample at once.
+        for samples in map(iter_samples, *file_args, repeat(False)):
+            _write_samples(samples, output, args.pretty_print, args.jsonl)
 
 
 if __name__ == "__main__":
@@ -675,3 +675,6 @@ class Header(ctypes.Structure, HeaderMixin):
     TStat = PStat
     CStat = None
     CGChainer = None
+    # The amount and length of PStats are stored in differently named Record and Header fields than later versions.
+    tstat_count_field = "nlist"
+    tstat_length_field = "pstatlen"
@@ -161,24 +161,7 @@ class CPUStat(ctypes.Structure):
     fields_limiters = {"cpu": "nrcpu"}
 
 
-class PerDSK(ctypes.Structure):
-    """Embedded struct to describe per disk information.
-
-    C Name: perdsk
-    C Location: photosyst.h
-    C Parent: dskstat
-    """
-
-    _fields_ = [
-        ("name", ctypes.c_char * MAXDKNAM),
-        ("nread", count_t),
-        ("nrsect", count_t),
-        ("nwrite", count_t),
-        ("nwsect", count_t),
-        ("io_ms", count_t),
-        ("avque", count_t),
-        ("cfuture", count_t * 4),
-    ]
+PerDSK = atop_1_26.PerDSK
 
 
 class DSKStat(ctypes.Structure):
@@ -8,6 +8,8 @@ to match python CamelCase standards. Each struct includes the following to help
 """
 
 import ctypes
+import functools
+import operator
 
 # Disable the following pylint warnings to allow the variables and classes to match the style from the C.
 # This helps with maintainability and cross-referencing.
@@ -24,14 +26,39 @@ off_t = ctypes.c_long
 pid_t = ctypes.c_int
 
 
+def install_limiters(struct_type: type) -> None:
+    """Add a property for every limited array field on a struct, which returns only the valid entries.
+
+    The property is named after the array field with a "_valid" suffix, e.g. "cpu_valid" for "cpu" limited by "nrcpu".
+
+    Args:
+        struct_type: C struct class with "fields_limiters" mapping array field names to the field with the valid count.
+    """
+    for field_name, limiter in getattr(struct_type, "fields_limiters", {}).items():
+        getter = operator.attrgetter(field_name)
+        count_getter = operator.attrgetter(limiter)
+        setattr(
+            struct_type,
+            f"{field_name}_valid",
+            property(
+                lambda struct, getter=getter, count_getter=count_getter: getter(struct)[: count_getter(struct)],
+                doc=f"Valid entries from {field_name}, limited by {limiter}.",
+            ),
+        )
+
+
 class HeaderMixin:
     """Shared logic for top level struct describing information contained in the log file.
 
     Attributes:
         supported_version: The version of Atop that this header is compatible with as <major.<minor>.
+        tstat_count_field: The name of the Record field containing the amount of TStats that follow the SStat.
+        tstat_length_field: The name of the Header field containing the byte length of each TStat in the file.
     """
 
     supported_version: str
+    tstat_count_field: str = "ndeviat"
+    tstat_length_field: str = "tstatlen"
     Record: ctypes.Structure
     SStat: ctypes.Structure
     TStat: ctypes.Structure
@@ -44,22 +71,39 @@ class HeaderMixin:
         Raises:
             ValueError if not compatible.
         """
+        struct_sizes = self._struct_sizes()
         sizes = [
-            ("Header", self.rawheadlen, ctypes.sizeof(self.__class__)),
-            ("Record", self.rawreclen, ctypes.sizeof(self.Record)),
-            ("SStat", self.sstatlen, ctypes.sizeof(self.SStat)),
+            ("Header", self.rawheadlen, struct_sizes["Header"]),
+            ("Record", self.rawreclen, struct_sizes["Record"]),
+            ("SStat", self.sstatlen, struct_sizes["SStat"]),
         ]
         if self.major_version >= 2 and self.minor_version >= 3:
-            sizes.append(("TStat", self.tstatlen, ctypes.sizeof(self.TStat)))
+            sizes.append(("TStat", self.tstatlen, struct_sizes["TStat"]))
         else:
-            sizes.append(("PStat", self.pstatlen, ctypes.sizeof(self.TStat)))
+            sizes.append(("PStat", self.pstatlen, struct_sizes["TStat"]))
         if self.major_version >= 2 and self.minor_version >= 11:
-            sizes.append(("CStat", self.cstatlen, ctypes.sizeof(self.CStat)))
+            sizes.append(("CStat", self.cstatlen, struct_sizes["CStat"]))
         if any(size[1] != size[2] for size in sizes):
             raise ValueError(
                 f"File has incompatible Atop format. Struct length evaluations (type, found, expected): {sizes}"
             )
 
+    @classmethod
+    @functools.cache
+    def _struct_sizes(cls) -> dict[str, int]:
+        """Calculate the length of every struct described by the header once per header version.
+
+        Returns:
+            The byte length of the header, and every struct type the header describes, by name.
+        """
+        return {
+            "Header": ctypes.sizeof(cls),
+            "Record": ctypes.sizeof(cls.Record),
+            "SStat": ctypes.sizeof(cls.SStat),
+            "TStat": ctypes.sizeof(cls.TStat),
+            "CStat": ctypes.sizeof(cls.CStat) if cls.CStat is not None else 0,
+        }
+
     @property
     def major_version(self) -> int:
         """The major version from the semantic version."""
@@ -1,9 +1,14 @@
 """Unit tests for Atop utilities."""
 
+import array
+import ctypes
+import functools
 import gzip
 import io
 import json
 import os
+import pathlib
+import sys
 import zlib
 from types import ModuleType
 from typing import Callable
@@ -17,11 +22,27 @@ from atoparser.structs import atop_1_26 as atop_1_26_structs
 
 TEST_FILE_DIR = os.path.join(os.path.dirname(__file__), "files")
 
+
+@functools.cache
+def _read_fixture(log: str) -> bytes:
+    """Read the uncompressed bytes of a test log once, to avoid decompressing the same log in every test."""
+    path = os.path.join(TEST_FILE_DIR, log)
+    opener = open if not log.endswith(".gz") else gzip.open
+    with opener(path, "rb") as raw_file:
+        return raw_file.read()
+
+
+def _open_log(log: str) -> io.BytesIO:
+    """Open an in memory copy of a test log, by name or path, as an uncompressed file."""
+    return io.BytesIO(_read_fixture(log))
+
+
 # Store raw byes from an Atop file which can be used to simulate calling struct readers while raising errors.
-with gzip.open(os.path.join(TEST_FILE_DIR, "atop_1_26.log.gz")) as raw_file:
-    HEADER_BYTES = bytearray(atoparser.get_header(raw_file))
-    _record = atoparser.get_record(raw_file, atop_1_26_structs.Header.from_buffer(HEADER_BYTES))
-    RECORD_BYTES = bytearray(_record)
+with _open_log("atop_1_26.log.gz") as raw_file:
+    HEADER_BYTES = bytes(atoparser.get_header(raw_file))
+    HEADER = atop_1_26_structs.Header.from_buffer_copy(HEADER_BYTES)
+    _record = atoparser.get_record(raw_file, HEADER)
+    RECORD_BYTES = bytes(_record)
     SSTAT_BYTES = raw_file.read(_record.scomplen)
 
 TEST_CASES = {
@@ -1141,6 +1162,62 @@ TEST_CASES = {
             },
         },
     },
+    "generate_statistics_batched": {
+        "Full batches": {
+            "args": [
+                os.path.join(TEST_FILE_DIR, "atop_2_11.log.gz"),
+                5,
+            ],
+            "returns": [5],
+        },
+        "Partial batch": {
+            "args": [
+                os.path.join(TEST_FILE_DIR, "atop_2_11.log.gz"),
+                2,
+            ],
+            "returns": [2, 2, 1],
+        },
+        "Empty batch": {
+            "args": [
+                os.path.join(TEST_FILE_DIR, "atop_2_11.log.gz"),
+                0,
+            ],
+            "raises": ValueError,
+        },
+        "Negative batch": {
+            "args": [
+                os.path.join(TEST_FILE_DIR, "atop_2_11.log.gz"),
+                -1,
+            ],
+            "raises": ValueError,
+        },
+    },
+    "generate_statistics_prefetch": {
+        "1.26": {
+            "args": [
+                os.path.join(TEST_FILE_DIR, "atop_1_26.log.gz"),
+            ],
+            "returns": {
+                "curtime": 1705174821,
+                "samples": 5,
+            },
+        },
+        "2.11": {
+            "args": [
+                os.path.join(TEST_FILE_DIR, "atop_2_11.log.gz"),
+            ],
+            "returns": {
+                "curtime": 1726329658,
+                "samples": 5,
+            },
+        },
+        "Truncated": {
+            "args": [
+                io.BytesIO(HEADER_BYTES + RECORD_BYTES + SSTAT_BYTES[:16]),
+            ],
+            "raises": zlib.error,
+        },
+    },
     "get_header": {
         "Valid": {
             "args": [
@@ -1186,7 +1263,7 @@ TEST_CASES = {
         "Valid": {
             "args": [
                 io.BytesIO(HEADER_BYTES + RECORD_BYTES),
-                atop_1_26_structs.Header.from_buffer(HEADER_BYTES),
+                HEADER,
             ],
             "returns": {
                 "curtime": 1705174817,
@@ -1206,7 +1283,7 @@ TEST_CASES = {
         "Truncated": {
             "args": [
                 io.BytesIO(HEADER_BYTES + RECORD_BYTES[:16]),
-                atop_1_26_structs.Header.from_buffer(HEADER_BYTES),
+                HEADER,
             ],
             "returns": {
                 "curtime": 1705174817,
@@ -1228,7 +1305,7 @@ TEST_CASES = {
         "Valid": {
             "args": [
                 io.BytesIO(HEADER_BYTES + RECORD_BYTES + SSTAT_BYTES),
-                atop_1_26_structs.Header.from_buffer(HEADER_BYTES),
+                HEADER,
             ],
             "returns": {
                 "cpu": {
@@ -1252,7 +1329,7 @@ TEST_CASES = {
         "Truncated": {
             "args": [
                 io.BytesIO(HEADER_BYTES + RECORD_BYTES + SSTAT_BYTES[:16]),
-                atop_1_26_structs.Header.from_buffer(HEADER_BYTES),
+                HEADER,
             ],
             "raises": zlib.error,
         },
@@ -1462,14 +1539,81 @@ TEST_CASES = {
             },
         }
     },
+    "iter_samples": {
+        "Full structs": {
+            "args": [
+                os.path.join(TEST_FILE_DIR, "atop_2_11.log.gz"),
+            ],
+            "kwargs": {
+                "include_tstats": True,
+                "include_cstats": True,
+            },
+            "returns": {
+                "keys": ["cgroup", "header", "record", "sstat", "tstat"],
+                "samples": 5,
+            },
+        },
+        "Parseables": {
+            "args": [
+                os.path.join(TEST_FILE_DIR, "atop_1_26.log.gz"),
+                ["CPL", "CPU"],
+            ],
+            "returns": {
+                "keys": [
+                    "context_switches",
+                    "interrupts",
+                    "interval",
+                    "load_1",
+                    "load_15",
+                    "load_5",
+                    "parseable",
+                    "procs",
+                    "timestamp",
+                ],
+                "samples": 10,
+            },
+        },
+        "Parseables unsupported": {
+            "args": [
+                os.path.join(TEST_FILE_DIR, "atop_2_11.log.gz"),
+                ["CPL"],
+            ],
+            "returns": {
+                "keys": ["error", "file"],
+                "samples": 1,
+            },
+        },
+    },
+    "write_samples": {
+        "Full structs": {
+            "args": [
+                os.path.join(TEST_FILE_DIR, "atop_2_11.log.gz"),
+            ],
+            "kwargs": {
+                "include_tstats": True,
+                "include_cstats": True,
+            },
+        },
+        "Parseables": {
+            "args": [
+                os.path.join(TEST_FILE_DIR, "atop_1_26.log.gz"),
+                ["CPL", "CPU", "PRC"],
+            ],
+        },
+        "Parseables unsupported": {
+            "args": [
+                os.path.join(TEST_FILE_DIR, "atop_2_11.log.gz"),
+                ["CPL"],
+            ],
+        },
+    },
 }
 
 
 def _read_log(log: str) -> list[dict]:
     """Convert an Atop log into an easily testable structured result."""
     samples = []
-    opener = open if not log.endswith(".gz") else gzip.open
-    with opener(log, "rb") as raw_file:
+    with _open_log(log) as raw_file:
         header = atoparser.get_header(raw_file)
         for index, (record, sstat, tstats, cgroups) in enumerate(atoparser.generate_statistics(raw_file, header)):
             converted = {
@@ -1488,8 +1632,7 @@ def _read_log(log: str) -> list[dict]:
 def _read_parseables(log: str, parseables: list[str], module: ModuleType) -> list[dict]:
     """Convert an Atop log's "parseables" into an easily testable structured result."""
     samples = []
-    opener = open if not log.endswith(".gz") else gzip.open
-    with opener(log, "rb") as raw_file:
+    with _open_log(log) as raw_file:
         header = atoparser.get_header(raw_file)
         parsers = {parseable: getattr(module, f"parse_{parseable}") for parseable in parseables}
         for record, sstat, tstat, cstat in atoparser.generate_statistics(raw_file, header, raise_on_truncation=False):
@@ -1567,8 +1710,7 @@ def test_file_header(test_case: dict, function_tester: Callable) -> None:
 
     def _get_struct(log: str) -> dict:
         """Read a log and return the header."""
-        opener = open if not log.endswith(".gz") else gzip.open
-        with opener(log, "rb") as raw_file:
+        with _open_log(log) as raw_file:
             raw_header = atoparser.get_header(raw_file)
             header = atoparser.struct_to_dict(raw_header)
             header["semantic_version"] = raw_header.semantic_version
@@ -1636,6 +1778,275 @@ def test_file_cstat(test_case: dict, function_tester: Callable) -> None:
     function_tester(test_case, _get_struct)
 
 
+@pytest.mark.parametrize_test_case("test_case", TEST_CASES["generate_statistics_batched"])
+def test_generate_statistics_batched(test_case: dict, function_tester: Callable) -> None:
+    """Read a file in batches and ensure all samples are returned in order."""
+
+    def _read_batches(log: str, batch: int) -> list[int]:
+        """Read a log in batches and return the size of every batch."""
+        with _open_log(log) as raw_file:
+            batches = list(atoparser.generate_statistics_batched(raw_file, batch=batch))
+        with _open_log(log) as raw_file:
+            expected = [record.curtime for record, _, _, _ in atoparser.generate_statistics(raw_file)]
+        assert [record.curtime for chunk in batches for record, _, _, _ in chunk] == expected
+        return [len(chunk) for chunk in batches]
+
+    function_tester(test_case, _read_batches)
+
+
+@pytest.mark.parametrize_test_case("test_case", TEST_CASES["generate_statistics_prefetch"])
+def test_generate_statistics_prefetch(test_case: dict, function_tester: Callable) -> None:
+    """Read a file with background prefetching and ensure all samples are returned in order."""
+
+    def _read_samples(log: str | io.BytesIO) -> dict:
+        """Read a log and return the amount of samples, and the time of the last sample."""
+        if isinstance(log, io.BytesIO):
+            samples = list(atoparser.generate_statistics(log, prefetch=True))
+        else:
+            with _open_log(log) as raw_file:
+                samples = list(atoparser.generate_statistics(raw_file, prefetch=True))
+        return {
+            "curtime": samples[-1][0].curtime,
+            "samples": len(samples),
+        }
+
+    function_tester(test_case, _read_samples)
+
+
+@pytest.mark.parametrize_test_case("log", ["atop_1_26.log.gz", "atop_2_11.log.gz"])
+def test_mapped_file(log: str, tmp_path: pathlib.Path) -> None:
+    """Read an uncompressed file through a memory map and ensure the samples match a standard file read."""
+    uncompressed_log = tmp_path / log.removesuffix(".gz")
+    with _open_log(log) as raw_file:
+        uncompressed_log.write_bytes(raw_file.read())
+
+    with atoparser.MappedFile(str(uncompressed_log)) as raw_file:
+        header = atoparser.get_header(raw_file)
+        mapped = [
+            [atoparser.struct_to_dict(record), atoparser.struct_to_dict(sstat)]
+            for record, sstat, _, _ in atoparser.generate_statistics(raw_file, header)
+        ]
+    with open(uncompressed_log, "rb") as raw_file:
+        header = atoparser.get_header(raw_file)
+        expected = [
+            [atoparser.struct_to_dict(record), atoparser.struct_to_dict(sstat)]
+            for record, sstat, _, _ in atoparser.generate_statistics(raw_file, header)
+        ]
+    assert mapped == expected
+
+    # Stop reading early, and hold a view from a direct read, to ensure the file can still be closed.
+    with atoparser.MappedFile(str(uncompressed_log)) as raw_file:
+        samples = atoparser.generate_statistics(raw_file)
+        record, _, _, _ = next(samples)
+        view = raw_file.read(16)
+    assert record.curtime == expected[0][0]["curtime"]
+    assert len(bytes(view)) == 16
+
+
+@pytest.mark.parametrize_test_case("log", ["atop_1_26.log.gz", "atop_2_11.log.gz"])
+def test_tstat_length(log: str) -> None:
+    """Read TStats that are longer in the file than the struct, and ensure each struct starts at the header's length."""
+    with _open_log(log) as raw_file:
+        header = atoparser.get_header(raw_file)
+        record, _, tstats, _ = next(atoparser.generate_statistics(raw_file, header))
+
+    padding = 8
+    compressed = zlib.compress(b"".join(bytes(tstat) + b"\xff" * padding for tstat in tstats))
+    record.pcomplen = len(compressed)
+    setattr(header, header.tstat_length_field, getattr(header, header.tstat_length_field) + padding)
+    padded_tstats = atoparser.get_tstat(io.BytesIO(compressed), header, record)
+    assert [atoparser.struct_to_dict(tstat) for tstat in padded_tstats] == [
+        atoparser.struct_to_dict(tstat) for tstat in tstats
+    ]
+
+
+@pytest.mark.parametrize_test_case("log", ["atop_1_26.log.gz", "atop_2_11.log.gz"])
+def test_struct_columns(log: str) -> None:
+    """Extract TStat fields as columns and ensure they match the values from every individual struct."""
+    fields = ["gen.name", "cpu.utime", "gen.pid", "mem.rmem"]
+    with _open_log(log) as raw_file:
+        for _, _, tstats, _ in atoparser.generate_statistics(raw_file):
+            expected = {
+                "gen.name": [tstat.gen.name.decode() for tstat in tstats],
+                "cpu.utime": [tstat.cpu.utime for tstat in tstats],
+                "gen.pid": [tstat.gen.pid for tstat in tstats],
+                "mem.rmem": [tstat.mem.rmem for tstat in tstats],
+            }
+            assert atoparser.struct_columns(tstats, fields) == expected
+            assert isinstance(tstats, list)
+            columns = atoparser.struct_columns(tstats, fields, as_arrays=True)
+            assert isinstance(columns["gen.pid"], array.array)
+            assert {name: list(column) for name, column in columns.items()} == expected
+
+    with pytest.raises(ValueError):
+        atoparser.struct_columns(tstats, ["gen.missing"])
+    with pytest.raises(ValueError):
+        atoparser.struct_columns(tstats, ["gen"])
+    assert atoparser.struct_columns([], fields) == {field: [] for field in fields}
+
+
+@pytest.mark.parametrize_test_case("log", ["atop_1_26.log.gz", "atop_2_11.log.gz"])
+def test_limited_fields(log: str) -> None:
+    """Ensure limited array properties only return the valid entries of the array."""
+    with _open_log(log) as raw_file:
+        for _, sstat, _, _ in atoparser.generate_statistics(raw_file):
+            assert len(sstat.cpu.cpu_valid) == sstat.cpu.nrcpu
+            assert len(sstat.dsk.dsk_valid) == sstat.dsk.ndsk
+            assert [cpu.utime for cpu in sstat.cpu.cpu_valid] == [cpu.utime for cpu in sstat.cpu.cpu[: sstat.cpu.nrcpu]]
+            columns = atoparser.struct_columns(sstat.cpu.cpu, ["utime", "stime"], count=sstat.cpu.nrcpu)
+            assert columns["stime"] == [cpu.stime for cpu in sstat.cpu.cpu_valid]
+
+
+@pytest.mark.parametrize_test_case("log", ["atop_1_26.log.gz", "atop_2_11.log.gz"])
+def test_read_field(log: str) -> None:
+    """Read fields directly from raw bytes and ensure they match the values from the structs."""
+    with _open_log(log) as raw_file:
+        header = atoparser.get_header(raw_file)
+        assert atoparser.read_field(type(header), bytes(header), "utsname.nodename") == header.utsname.nodename.decode()
+        for _, sstat, tstats, _ in atoparser.generate_statistics(raw_file, header):
+            assert atoparser.read_field(header.SStat, bytes(sstat), "mem.physmem") == sstat.mem.physmem
+            raw_tstats = b"".join(tstats)
+            for index, tstat in enumerate(tstats):
+                offset = index * ctypes.sizeof(header.TStat)
+                assert atoparser.read_field(header.TStat, raw_tstats, "gen.pid", offset) == tstat.gen.pid
+
+    with pytest.raises(ValueError):
+        atoparser.read_field(header.SStat, bytes(sstat), "mem")
+
+
+@pytest.mark.parametrize_test_case("log", ["atop_1_26.log.gz", "atop_2_11.log.gz"])
+def test_struct_format(log: str) -> None:
+    """Unpack structs with their struct module format and ensure the values match every field in the struct."""
+
+    def _flatten(value: object) -> list:
+        """Recursively flatten struct and array values in field order."""
+        if isinstance(value, ctypes.Structure):
+            return [item for field in value._fields_ for item in _flatten(getattr(value, field[0]))]
+        if isinstance(value, ctypes.Array):
+            return [item for sub_value in value for item in _flatten(sub_value)]
+        return [value]
+
+    with _open_log(log) as raw_file:
+        header = atoparser.get_header(raw_file)
+        for record, sstat, tstats, _ in atoparser.generate_statistics(raw_file, header):
+            for struct in [header, record, sstat, *tstats]:
+                struct_format = atoparser.struct_format(type(struct))
+                assert struct_format.size == ctypes.sizeof(struct)
+                values = [
+                    value.split(b"\0", 1)[0] if isinstance(value, bytes) and len(value) > 1 else value
+                    for value in struct_format.unpack_from(bytes(struct))
+                ]
+                assert values == _flatten(struct)
+                assert len(atoparser.struct_fields(type(struct))) == len(values)
+
+                compact = atoparser.struct_format(type(struct), skip_future=True)
+                assert compact.size == struct_format.size
+                row = dict(zip(atoparser.struct_fields(type(struct)), struct_format.unpack_from(bytes(struct))))
+                compact_row = dict(
+                    zip(atoparser.struct_fields(type(struct), skip_future=True), compact.unpack_from(bytes(struct)))
+                )
+                assert compact_row == {name: value for name, value in row.items() if name in compact_row}
+                assert not any("future" in name for name in compact_row)
+
+
+def test_bit_fields() -> None:
+    """Convert structs with bit fields, and ensure they are accessed individually instead of unpacked as a layout."""
+
+    class Flags(ctypes.Structure):
+        """Synthetic struct with bit fields sharing a single integer."""
+
+        _fields_ = [
+            ("low", ctypes.c_int, 3),
+            ("high", ctypes.c_int, 5),
+            ("name", ctypes.c_char * 4),
+        ]
+
+    struct = Flags(3, 7, b"atop")
+    assert atoparser.struct_to_dict(struct) == {"low": 3, "high": 7, "name": "atop"}
+    with pytest.raises(ValueError):
+        atoparser.struct_format(Flags)
+    with pytest.raises(ValueError):
+        atoparser.struct_columns((Flags * 1)(struct), ["low"])
+    assert atoparser.struct_columns((Flags * 1)(struct), ["name"]) == {"name": ["atop"]}
+
+
+def test_keyword_fields() -> None:
+    """Convert structs with fields named after Python keywords, and ensure they are accessed by name."""
+
+    class Keywords(ctypes.Structure):
+        """Synthetic struct with keyword field names, including a nested struct to avoid the single unpack."""
+
+        fields_limiters = {"values": "in"}
+        _fields_ = [
+            ("from", ctypes.c_int),
+            ("in", ctypes.c_int),
+            ("values", ctypes.c_int * 4),
+            ("inner", atop_1_26_structs.UTSName),
+        ]
+
+    struct = Keywords(1, 2, (ctypes.c_int * 4)(5, 6, 7, 8))
+    converted = atoparser.struct_to_dict(struct)
+    assert [converted["from"], converted["in"], converted["values"]] == [1, 2, [5, 6]]
+    with pytest.raises(ValueError):
+        atoparser.struct_to_namedtuple(struct)
+
+
+def test_unsupported_format_fields() -> None:
+    """Convert structs with fields the struct module cannot represent, and ensure they use the C struct values."""
+
+    class Pointers(ctypes.Structure):
+        """Synthetic struct with pointer, wide character, and long double fields."""
+
+        _fields_ = [
+            ("count", ctypes.c_int),
+            ("address", ctypes.c_void_p),
+            ("name", ctypes.c_char_p),
+            ("missing", ctypes.c_char_p),
+            ("letter", ctypes.c_wchar),
+            ("label", ctypes.c_wchar * 4),
+            ("precise", ctypes.c_longdouble),
+        ]
+
+    struct = Pointers(3, None, b"atop", None, "a", "ab", 1.5)
+    expected = {
+        "count": 3,
+        "address": None,
+        "name": "atop",
+        "missing": None,
+        "letter": "a",
+        "label": "ab",
+        "precise": 1.5,
+    }
+    assert atoparser.struct_to_dict(struct) == expected
+    assert atoparser.struct_to_namedtuple(struct)._asdict() == expected
+    with pytest.raises(ValueError):
+        atoparser.struct_format(Pointers)
+    with pytest.raises(ValueError):
+        atoparser.struct_fields(Pointers)
+
+
+@pytest.mark.parametrize_test_case("log", ["atop_1_26.log.gz", "atop_2_11.log.gz"])
+def test_struct_to_namedtuple(log: str) -> None:
+    """Convert structs into named tuples and ensure they match the dictionary conversions."""
+
+    def _to_dict(value: object) -> object:
+        """Recursively convert named tuples into dictionaries, and array tuples into lists."""
+        if hasattr(value, "_fields"):
+            return {name: _to_dict(sub_value) for name, sub_value in zip(value._fields, value)}
+        if isinstance(value, tuple):
+            return [_to_dict(sub_value) for sub_value in value]
+        return value
+
+    with _open_log(log) as raw_file:
+        header = atoparser.get_header(raw_file)
+        assert _to_dict(atoparser.struct_to_namedtuple(header)) == atoparser.struct_to_dict(header)
+        for record, sstat, tstats, cgroups in atoparser.generate_statistics(raw_file, header):
+            for struct in [record, sstat, *tstats, *cgroups]:
+                converted = atoparser.struct_to_namedtuple(struct)
+                assert _to_dict(converted) == atoparser.struct_to_dict(struct)
+                assert hash(converted) == hash(atoparser.struct_to_namedtuple(struct))
+
+
 @pytest.mark.parametrize_test_case("test_case", TEST_CASES["get_header"])
 def test_get_header(test_case: dict, function_tester: Callable) -> None:
     """Unit tests for get_header."""
@@ -1711,3 +2122,117 @@ def test_parseable(test_case: dict, function_tester: Callable) -> None:
         return json.loads(json.dumps(last_values, sort_keys=True))
 
     function_tester(test_case, _get_parseables)
+
+
+@pytest.mark.parametrize_test_case("test_case", TEST_CASES["iter_samples"])
+def test_iter_samples(test_case: dict, function_tester: Callable) -> None:
+    """Read a file with the reader and ensure the output samples match expectations."""
+
+    def _iter_samples(*args: list, **kwargs: dict) -> dict:
+        """Read a log and return the amount of samples, and the keys from the first sample."""
+        samples = list(reader.iter_samples(*args, **kwargs))
+        return {
+            "keys": sorted(samples[0].keys()),
+            "samples": len(samples),
+        }
+
+    function_tester(test_case, _iter_samples)
+
+
+@pytest.mark.parametrize_test_case("test_case", TEST_CASES["write_samples"])
+@pytest.mark.parametrize("pretty_print", [False, True], ids=["compact", "pretty"])
+@pytest.mark.parametrize("use_orjson", [True, False], ids=["orjson", "json"])
+def test_write_samples(test_case: dict, pretty_print: bool, use_orjson: bool, monkeypatch: pytest.MonkeyPatch) -> None:
+    """Stream samples with the reader and ensure the output matches serializing the full list of samples at once."""
+    if use_orjson:
+        orjson = pytest.importorskip("orjson")
+
+        def _dumps(value: list) -> bytes:
+            """Serialize a full list of samples at once with orjson."""
+            return orjson.dumps(value, option=orjson.OPT_INDENT_2 if pretty_print else 0) + b"\n"
+
+    else:
+        monkeypatch.setattr(reader, "orjson", None)
+
+        def _dumps(value: list) -> bytes:
+            """Serialize a full list of samples at once with the standard library."""
+            return json.dumps(value, indent=2 if pretty_print else None).encode() + b"\n"
+
+    args = test_case.get("args", [])
+    kwargs = test_case.get("kwargs", {})
+    samples = list(reader.iter_samples(*args, **kwargs))
+    # Unconverted structs must be serialized by the default handler into the same output as the converted samples.
+    for streamed, expected in (
+        (iter(samples), samples),
+        (reader.iter_samples(*args, **kwargs, convert_stats=False), samples),
+        (iter([]), []),
+    ):
+        output = io.BytesIO()
+        reader._write_samples(streamed, output, pretty_print=pretty_print)  # pylint: disable=protected-access
+        assert output.getvalue() == _dumps(expected)
+
+
+@pytest.mark.parametrize_test_case("test_case", TEST_CASES["write_samples"])
+def test_write_samples_jsonl(test_case: dict) -> None:
+    """Stream samples with the reader as JSON lines and ensure every line matches a single sample."""
+    samples = list(reader.iter_samples(*test_case.get("args", []), **test_case.get("kwargs", {})))
+    unconverted = reader.iter_samples(*test_case.get("args", []), **test_case.get("kwargs", {}), convert_stats=False)
+    output = io.BytesIO()
+    reader._write_samples(unconverted, output, pretty_print=True, jsonl=True)  # pylint: disable=protected-access
+    lines = output.getvalue().split(b"\n")
+    assert lines.pop() == b""
+    assert [json.loads(line) for line in lines] == samples
+
+
+@pytest.mark.parametrize_test_case("log", ["atop_1_26.log.gz", "atop_2_11.log.gz"])
+def test_ctypes_default(log: str) -> None:
+    """Serialize raw C arrays and structs with the reader's default handler and ensure they match the conversions."""
+    with _open_log(log) as raw_file:
+        header = atoparser.get_header(raw_file)
+        _, sstat, tstats, _ = next(atoparser.generate_statistics(raw_file, header))
+    raw_tstats = (header.TStat * len(tstats))(*tstats)
+    sample = {"sstat": sstat, "tstat": raw_tstats}
+    expected = {"sstat": atoparser.struct_to_dict(sstat), "tstat": [atoparser.struct_to_dict(t) for t in tstats]}
+    assert json.loads(reader._dumps(sample)) == expected  # pylint: disable=protected-access
+    with pytest.raises(TypeError):
+        reader._dumps({"value": object()})  # pylint: disable=protected-access
+
+
+@pytest.mark.parametrize_test_case("test_case", TEST_CASES["write_samples"])
+@pytest.mark.parametrize("jsonl", [False, True], ids=["json", "jsonl"])
+def test_render_file(test_case: dict, jsonl: bool) -> None:
+    """Render a file as a parallel worker would, and ensure the output matches streaming the samples directly."""
+    args = test_case.get("args", [])
+    kwargs = test_case.get("kwargs", {})
+    expected = io.BytesIO()
+    samples = reader.iter_samples(*args, **kwargs)
+    reader._write_samples(samples, expected, pretty_print=True, jsonl=jsonl)  # pylint: disable=protected-access
+    rendered = reader._render_file(  # pylint: disable=protected-access
+        args[0],
+        args[1] if len(args) > 1 else None,
+        kwargs.get("include_tstats", False),
+        kwargs.get("include_cstats", False),
+        pretty_print=True,
+        jsonl=jsonl,
+    )
+    assert rendered == expected.getvalue()
+
+
+@pytest.mark.parametrize("options", [["--tstats", "--cstats"], ["-p"], ["--jsonl"]], ids=["full", "pretty", "jsonl"])
+def test_reader_workers(options: list[str], monkeypatch: pytest.MonkeyPatch) -> None:
+    """Run the reader with multiple workers and ensure the output matches processing every file sequentially."""
+    files = [os.path.join(TEST_FILE_DIR, log) for log in ("atop_2_11.log.gz", "atop_1_26.log.gz", "atop_2_3.log.gz")]
+
+    def _run(workers: int) -> bytes:
+        """Run the reader with the requested amount of workers and return the raw output."""
+        stdout = io.TextIOWrapper(io.BytesIO())
+        monkeypatch.setattr(sys, "argv", ["reader", *files, *options, "-w", str(workers)])
+        monkeypatch.setattr(sys, "stdout", stdout)
+        reader.main()
+        return stdout.buffer.getvalue()
+
+    sequential = _run(1)
+    assert sequential
+    # Use fewer workers than files to ensure later files are only submitted as earlier files are written.
+    assert _run(2) == sequential
+    assert _run(len(files)) == sequential
@@ -26,11 +26,22 @@ The basic layout of an Atop log file can be described as the following:
 
 from __future__ import annotations
 
+import collections
 import ctypes
 import io
+import itertools
+import keyword
+import mmap
+import queue
+import threading
 import zlib
+from struct import Struct
+from typing import Callable
+from typing import Iterator
 from typing import Union
 
+from atoparser.layout import is_future_field
+from atoparser.layout import struct_format
 from atoparser.structs import atop_1_26
 from atoparser.structs import atop_2_3
 from atoparser.structs import atop_2_4
@@ -41,8 +52,15 @@ from atoparser.structs import atop_2_8
 from atoparser.structs import atop_2_9
 from atoparser.structs import atop_2_10
 from atoparser.structs import atop_2_11
+from atoparser.structs.shared import install_limiters
 from atoparser.structs.shared import pid_t
 
+try:
+    # ISA-L provides a drop-in accelerated inflate when available. Fallback to the standard library if not installed.
+    from isal import isal_zlib as _zlib
+except ImportError:
+    _zlib = zlib
+
 _VERSIONS = [
     atop_1_26,
     atop_2_3,
@@ -56,9 +74,19 @@ _VERSIONS = [
     atop_2_11,
 ]
 _CSTAT_VERSIONS = _VERSIONS[9:]
+# Provide direct access to only the valid entries of limited arrays on every struct, e.g. "cpu_valid" for "cpu".
+for _struct_type in {
+    value
+    for module in _VERSIONS
+    for value in vars(module).values()
+    if isinstance(value, type) and issubclass(value, ctypes.Structure)
+}:
+    install_limiters(_struct_type)
 # Fallback to latest if there is no custom class provided to attempt backwards compatibility.
 _DEFAULT_VERSION = _VERSIONS[-1].Header.supported_version
 _HEADER_BY_VERSION: dict[str, type[Header]] = {module.Header.supported_version: module.Header for module in _VERSIONS}
+# Headers with CStats following the TStats in every sample, precomputed to avoid version parsing per file.
+_CSTAT_HEADERS: frozenset[type[Header]] = frozenset(module.Header for module in _CSTAT_VERSIONS)
 
 Header = Union[tuple(header for header in _HEADER_BY_VERSION.values())]
 Record = Union[tuple(header.Record for header in _HEADER_BY_VERSION.values())]
@@ -76,12 +104,115 @@ MAX_SAMPLES_PER_FILE = 86400
 # Definition from rawlog.c
 MAGIC = 0xFEEDBEEF
 
+# Maximum amount of samples read ahead of the consumer when prefetching samples in the background.
+PREFETCH_DEPTH = 4
+_PREFETCH_DONE = object()
+
+# Field conversion kinds used when converting structs into dictionaries.
+_SCALAR = 0
+_BYTES = 1
+_STRUCT = 2
+_ARRAY = 3
+_STRUCT_ARRAY = 4
+_OPTIONAL_BYTES = 5
+# Generated converters for every struct type converted into a dictionary, to avoid repeating field introspection and
+# dispatching on field kinds per struct.
+_STRUCT_CONVERTERS: dict[type, Callable[[ctypes.Structure], dict]] = {}
+_TUPLE_CONVERTERS: dict[type, Callable[[ctypes.Structure], tuple]] = {}
+
+
+class MappedFile:
+    """Read only file like object backed by a memory mapped file.
+
+    Reads return views directly into the mapped pages instead of copying into new bytes objects, and do not require
+    a system call per read. Only suitable for uncompressed Atop files.
+    """
+
+    def __init__(self, path: str) -> None:
+        """Map the file into memory for reading.
+
+        Args:
+            path: Path to the uncompressed file to read.
+        """
+        with open(path, "rb") as file:
+            self._mmap = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        self._mmap.madvise(mmap.MADV_SEQUENTIAL)
+        self._view = memoryview(self._mmap)
+        self._offset = 0
+
+    def __enter__(self) -> MappedFile:
+        return self
+
+    def __exit__(self, *args: object) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """Release the memory mapped file.
+
+        If views returned by read are still referenced, the file is unmapped once they are no longer in use.
+        """
+        self._view.release()
+        try:
+            self._mmap.close()
+        except BufferError:
+            # Views into the map are still held by the caller. The map is closed when the last view is released.
+            pass
+
+    def read(self, size: int = -1) -> memoryview:
+        """Read up to size bytes from the current position as a view into the mapped file, or all if negative."""
+        start = self._offset
+        end = len(self._view) if size < 0 else min(start + size, len(self._view))
+        self._offset = end
+        return self._view[start:end]
+
+    def readinto(self, buffer: ctypes.Structure | bytearray) -> int:
+        """Read bytes from the current position directly into a writable buffer, such as a C struct."""
+        target = memoryview(buffer).cast("B")
+        data = self.read(len(target))
+        target[: len(data)] = data
+        return len(data)
+
+    def seek(self, offset: int, whence: int = io.SEEK_SET) -> int:
+        """Change the current position relative to the start, current position, or end of the file."""
+        if whence == io.SEEK_CUR:
+            offset += self._offset
+        elif whence == io.SEEK_END:
+            offset += len(self._view)
+        self._offset = max(0, offset)
+        return self._offset
+
+    def tell(self) -> int:
+        """Current position in the file."""
+        return self._offset
+
+
+def _decompress(buffer: bytes, bufsize: int = zlib.DEF_BUF_SIZE) -> bytes:
+    """Decompress a zlib compressed buffer using the fastest available implementation.
+
+    Args:
+        buffer: The compressed bytes to decompress.
+        bufsize: The initial size of the output buffer.
+
+    Returns:
+        The decompressed bytes.
+
+    Raises:
+        zlib.error if the bytes could not be decompressed, regardless of the implementation used.
+    """
+    try:
+        return _zlib.decompress(buffer, bufsize=bufsize)
+    except _zlib.error as error:
+        if _zlib is zlib:
+            raise
+        raise zlib.error(str(error)) from error
+
 
 def generate_statistics(
     raw_file: io.BytesIO,
     header: Header = None,
     raise_on_truncation: bool = True,
     max_samples: int = MAX_SAMPLES_PER_FILE,
+    prefetch: bool = False,
 ) -> tuple[Record, SStat, list[TStat], list[CGChainer]]:
     """Read statistics groups from an open Atop log file.
 
@@ -90,6 +221,8 @@ def generate_statistics(
         header: The header from the file containing metadata about records to read. If not provided, one will be read.
         raise_on_truncation: Raise compression exceptions after header is read. e.g. Software restarts
         max_samples: Maximum number of samples read from a file.
+        prefetch: Read and decompress upcoming samples in a background thread while the current sample is processed.
+            Decompression releases the GIL, allowing it to overlap with processing by the consumer.
 
     Yields:
         The next record, sstat, tstat list, and cstat list statistic groups after reading in raw bytes to objects.
@@ -98,33 +231,141 @@ def generate_statistics(
         # If a header was not provided, read up to the proper length and discard to ensure the correct starting offset.
         header = get_header(raw_file)
 
+    samples = _read_samples(raw_file, header, max_samples)
+    if prefetch:
+        samples = _prefetch(samples, PREFETCH_DEPTH)
     try:
-        header_version = header.semantic_version
-        major, minor = header_version.split(".")[:2]
-        major, minor = int(major), int(minor)
-        for _ in range(max_samples):
-            # Read the repeating structured information until the end of the file.
-            # Atop log files consist of the following after the header, repeated until the end:
-            # 1. Record: Metadata about statistics.
-            # 2. SStats: System statistics.
-            # 3. TStats: Task/process statistics.
-            # 4. CGChain/CStats: CGroup statistics.
-            record = get_record(raw_file, header)
-            if record.scomplen <= 0:
-                # Natural end-of-file, no further bytes were found to populate another record.
-                break
-            sstat = get_sstat(raw_file, header, record)
-            tstats = get_tstat(raw_file, header, record)
-            if major >= 2 and minor >= 11:
-                cgroups = get_cstat(raw_file, header, record)
-            else:
-                cgroups = []
-            yield record, sstat, tstats, cgroups
+        yield from samples
     except zlib.error:
         # End of readable data reached. This is common during software restarts.
         # All errors after the header are squashable errors, since that means the file is valid, but was not closed.
         if raise_on_truncation:
             raise
+    finally:
+        # Explicitly close the sample reader to ensure any background prefetching stops with the consumer.
+        samples.close()
+
+
+def generate_statistics_batched(
+    raw_file: io.BytesIO,
+    header: Header = None,
+    batch: int = 64,
+    **kwargs: object,
+) -> Iterator[list[tuple[Record, SStat, list[TStat], list[CGChainer]]]]:
+    """Read statistics groups from an open Atop log file, in batches.
+
+    Reduces per sample overhead for bulk consumers that do not need to process each sample as soon as it is read.
+
+    Args:
+        raw_file: An open Atop file capable of reading as bytes.
+        header: The header from the file containing metadata about records to read. If not provided, one will be read.
+        batch: Maximum number of statistics groups in each batch.
+        kwargs: Additional keyword arguments passed to generate_statistics.
+
+    Yields:
+        Lists of the next record, sstat, tstat list, and cstat list statistic groups, in order. The final batch
+        may contain less than the requested amount.
+
+    Raises:
+        ValueError if the batch size is less than 1.
+    """
+    if batch < 1:
+        raise ValueError(f"Batch size must be at least 1: {batch}")
+    samples = generate_statistics(raw_file, header, **kwargs)
+    try:
+        while chunk := list(itertools.islice(samples, batch)):
+            yield chunk
+    finally:
+        samples.close()
+
+
+def _read_samples(
+    raw_file: io.BytesIO,
+    header: Header,
+    max_samples: int,
+) -> tuple[Record, SStat, list[TStat], list[CGChainer]]:
+    """Read statistics groups from an open Atop log file, after the header.
+
+    Args:
+        raw_file: An open Atop file capable of reading as bytes.
+        header: The header from the file containing metadata about records to read.
+        max_samples: Maximum number of samples read from a file.
+
+    Yields:
+        The next record, sstat, tstat list, and cstat list statistic groups after reading in raw bytes to objects.
+    """
+    read_cstats = type(header) in _CSTAT_HEADERS
+    for _ in range(max_samples):
+        # Read the repeating structured information until the end of the file.
+        # Atop log files consist of the following after the header, repeated until the end:
+        # 1. Record: Metadata about statistics.
+        # 2. SStats: System statistics.
+        # 3. TStats: Task/process statistics.
+        # 4. CGChain/CStats: CGroup statistics.
+        record = get_record(raw_file, header)
+        if record.scomplen <= 0:
+            # Natural end-of-file, no further bytes were found to populate another record.
+            break
+        # The SStat and TStats are always adjacent, read both compressed payloads at once to reduce the amount of reads.
+        # Release the view before yielding, so that no reference to memory mapped files is held while suspended.
+        with memoryview(raw_file.read(record.scomplen + record.pcomplen)) as buffer:
+            sstat = _sstat_from_buffer(buffer[: record.scomplen], header)
+            tstats = _tstat_from_buffer(buffer[record.scomplen :], header, record)
+        if read_cstats:
+            cgroups = get_cstat(raw_file, header, record)
+        else:
+            cgroups = []
+        yield record, sstat, tstats, cgroups
+
+
+def _prefetch(values: Iterator, depth: int) -> Iterator:
+    """Produce values from an iterator in a background thread, to allow overlap with processing of previous values.
+
+    Args:
+        values: The iterator to produce values from.
+        depth: Maximum number of values to produce ahead of the consumer.
+
+    Yields:
+        The values from the original iterator, in the same order. Exceptions are raised in the consumer.
+    """
+    produced = queue.Queue(maxsize=depth)
+    stop = threading.Event()
+
+    def _put(item: tuple) -> bool:
+        """Add an item to the queue, or stop early if the consumer is no longer reading."""
+        while not stop.is_set():
+            try:
+                produced.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def _produce() -> None:
+        """Produce all values, followed by a final marker containing any error raised."""
+        try:
+            for value in values:
+                if not _put((value, None)):
+                    return
+        except Exception as error:  # pylint: disable=broad-exception-caught
+            _put((_PREFETCH_DONE, error))
+            return
+        _put((_PREFETCH_DONE, None))
+
+    producer = threading.Thread(target=_produce, daemon=True)
+    producer.start()
+    try:
+        while True:
+            value, error = produced.get()
+            if value is _PREFETCH_DONE:
+                if error is not None:
+                    raise error
+                return
+            yield value
+    finally:
+        # Ensure the producer exits if the consumer stops early, such as on error or break.
+        stop.set()
+        producer.join()
 
 
 def get_header(raw_file: io.BytesIO, check_compatibility: bool = True) -> Header:
@@ -142,17 +383,18 @@ def get_header(raw_file: io.BytesIO, check_compatibility: bool = True) -> Header
     """
     # Read the header directly into the struct, there is no padding to consume or add.
     # Use default Header as the baseline in order to check the version. It can be transferred without re-reading.
-    header = _HEADER_BY_VERSION[_DEFAULT_VERSION]()
+    default_cls = _HEADER_BY_VERSION[_DEFAULT_VERSION]
+    header = default_cls()
     raw_file.readinto(header)
 
     if header.magic != MAGIC:
         msg = f"File does not contain raw atop output (wrong magic number): {hex(header.magic)}"
         raise ValueError(msg)
 
-    header_version = header.semantic_version
-    if header_version != _DEFAULT_VERSION and header_version in _HEADER_BY_VERSION:
+    header_cls = _HEADER_BY_VERSION.get(header.semantic_version)
+    if header_cls is not None and header_cls is not default_cls:
         # Header byte length is consistent across versions. Transfer the initial read into the versioned header.
-        header = _HEADER_BY_VERSION[header_version].from_buffer(header)
+        header = header_cls.from_buffer(header)
 
     if check_compatibility:
         # Ensure all struct lengths match the lengths specified in the header. If not, we cannot read the file further.
@@ -203,7 +445,24 @@ def get_sstat(
     # Read the requested length instead of the length of the struct.
     # The data is compressed and must be decompressed before it will fill the struct.
     buffer = raw_file.read(record.scomplen)
-    decompressed = zlib.decompress(buffer)
+    return _sstat_from_buffer(buffer, header)
+
+
+def _sstat_from_buffer(buffer: bytes | memoryview, header: Header) -> SStat:
+    """Decompress a raw sstat.
+
+    Args:
+        buffer: The compressed bytes of a single SStat.
+        header: The header from the file containing metadata about records to read.
+
+    Returns:
+        A single struct representing the data after a raw record, but before an array of TStat structs.
+
+    Raises:
+        ValueError if there are not enough bytes to read a single stat.
+    """
+    # Size the output buffer to the final struct length up front to avoid repeated resizing while decompressing.
+    decompressed = _decompress(buffer, bufsize=ctypes.sizeof(header.SStat))
     sstat = header.SStat.from_buffer_copy(decompressed)
     return sstat
 
@@ -229,18 +488,41 @@ def get_tstat(
     # Read the requested length instead of the length of the struct.
     # The data is compressed and must be decompressed before it will fill the final list of structs.
     buffer = raw_file.read(record.pcomplen)
-    decompressed = zlib.decompress(buffer)
+    return _tstat_from_buffer(buffer, header, record)
 
-    record_count = record.nlist if isinstance(record, atop_1_26.Record) else record.ndeviat
-    tstatlen = header.tstatlen if header.major_version >= 2 and header.minor_version >= 3 else header.pstatlen
-    tstats = []
-    for index in range(record_count):
-        # Reconstruct one TStat struct for every possible byte chunk, incrementing the offset each pass. For example:
-        # First pass: 0 - 21650
-        # Second pass: 21651 - 43300
-        tstat = header.TStat.from_buffer_copy(decompressed[index * tstatlen : tstatlen * (index + 1)])
-        tstats.append(tstat)
-    return tstats
+
+def _tstat_from_buffer(buffer: bytes | memoryview, header: Header, record: Record) -> list[TStat]:
+    """Decompress a raw tstat array.
+
+    Args:
+        buffer: The compressed bytes of a TStat array.
+        header: The header from the file containing metadata about records to read.
+        record: The preceding record containing metadata about the TStats to read.
+
+    Returns:
+        All TStat structs after a raw SStat, but before the next raw record.
+
+    Raises:
+        ValueError if there are not enough bytes to read a stat array.
+    """
+    # Size the output buffer to the final array length up front to avoid repeated resizing while decompressing.
+    record_count = getattr(record, header.tstat_count_field)
+    tstatlen = getattr(header, header.tstat_length_field)
+    decompressed = _decompress(buffer, bufsize=tstatlen * record_count)
+
+    if tstatlen == ctypes.sizeof(header.TStat):
+        # Reconstruct every TStat struct with a single copy into a contiguous array, instead of slicing and copying per
+        # struct. Each struct in the list is a view into the array's memory, so no additional copies are made.
+        tstats = (header.TStat * record_count).from_buffer_copy(decompressed)
+        return list(tstats)
+
+    # The file's TStats are a different length than the struct, such as when compatibility checks are skipped.
+    # Reconstruct one TStat struct from the start of every byte chunk, incrementing the offset each pass.
+    decompressed = memoryview(decompressed)
+    return [
+        header.TStat.from_buffer_copy(decompressed[index * tstatlen : tstatlen * (index + 1)])
+        for index in range(record_count)
+    ]
 
 
 def get_cstat(
@@ -264,33 +546,237 @@ def get_cstat(
     # Read the requested length instead of the length of the struct.
     # The data is compressed and must be decompressed before it will fill the final list of structs.
     buffer_cstats = raw_file.read(record.ccomplen)
-    decompressed_cstats = zlib.decompress(buffer_cstats)
+    decompressed_cstats = _decompress(buffer_cstats)
     buffer_pidlist = raw_file.read(record.icomplen)
-    decompressed_pidlist = zlib.decompress(buffer_pidlist)
+    decompressed_pidlist = _decompress(buffer_pidlist)
 
-    cgroups = []
+    # Preallocate the output to avoid resizing while appending, and read each struct directly from its offset in the
+    # decompressed buffers to avoid creating an intermediate slice per struct.
+    cgroups = [None] * record.ncgroups
     cstat_start = 0
-    cstatlen = header.cstatlen
     pidlist_start = 0
-    for _ in range(record.ncgroups):
+    for index in range(record.ncgroups):
         # Reconstruct one CStat struct and pidlist for every possible byte chunk, incrementing the offset each pass.
         # For example:
         # First pass: 0 - 21650
         # Second pass: 21651 - 43300
         # N.B. The variable length cgname is currently unsupported. In order to properly skip the remaining bytes,
         # Use the final structlen from the nested gen struct to update the starting point.
-        cstat = header.CStat.from_buffer_copy(decompressed_cstats[cstat_start : cstat_start + cstatlen])
+        cstat = header.CStat.from_buffer_copy(decompressed_cstats, cstat_start)
         cstat_start += cstat.gen.structlen
 
         pid_array = pid_t * cstat.gen.nprocs
-        pid_array_size = ctypes.sizeof(pid_array)
-        pidlist = pid_array.from_buffer_copy(decompressed_pidlist[pidlist_start : pidlist_start + pid_array_size])
-        pidlist_start += pid_array_size
+        pidlist = pid_array.from_buffer_copy(decompressed_pidlist, pidlist_start)
+        pidlist_start += ctypes.sizeof(pid_array)
 
-        cgroups.append(header.CGChainer(cstat, pidlist))
+        cgroups[index] = header.CGChainer(cstat, pidlist)
     return cgroups
 
 
+def _build_struct_plan(struct_type: type) -> tuple[tuple[str, int, str | None, type | None], ...]:
+    """Precompute how every field in a struct type should be converted into a Python value.
+
+    Args:
+        struct_type: C struct, or C struct like, class to inspect.
+
+    Returns:
+        The name, conversion kind, optional limiter field name, and nested struct type if applicable, for every field
+        that should be converted.
+    """
+    limiters = getattr(struct_type, "fields_limiters", {})
+    plan = []
+    for field in struct_type._fields_:  # pylint: disable=protected-access
+        field_name = field[0]
+        # Generic aliases, such as ctypes.Array[pid_t] on custom C struct like classes, must use their origin to check.
+        field_type = getattr(field[1], "__origin__", field[1])
+        if issubclass(field_type, ctypes.Structure):
+            plan.append((field_name, _STRUCT, None, field_type))
+        elif is_future_field(field):
+            continue
+        elif field_type is ctypes.c_char_p:
+            # Character pointers are returned from the struct as bytes, or None if the pointer is null.
+            plan.append((field_name, _OPTIONAL_BYTES, None, None))
+        elif issubclass(field_type, ctypes.Array) and getattr(field_type, "_type_", None) is ctypes.c_wchar:
+            # Wide character arrays are returned from the struct as strings.
+            plan.append((field_name, _SCALAR, None, None))
+        elif issubclass(field_type, ctypes.Array) and getattr(field_type, "_type_", None) is not ctypes.c_char:
+            element_type = getattr(field_type, "_type_", None)
+            if element_type is not None and issubclass(element_type, ctypes.Structure):
+                plan.append((field_name, _STRUCT_ARRAY, limiters.get(field_name), element_type))
+            else:
+                plan.append((field_name, _ARRAY, limiters.get(field_name), None))
+        elif field_type is ctypes.c_char or issubclass(field_type, ctypes.Array):
+            # Single characters and character arrays are returned from the struct as bytes.
+            plan.append((field_name, _BYTES, None, None))
+        else:
+            plan.append((field_name, _SCALAR, None, None))
+    return tuple(plan)
+
+
+def _build_struct_unpacker(
+    struct_type: type,
+    plan: tuple[tuple[str, int, str | None, type | None], ...],
+) -> tuple[Struct, tuple[str, ...], tuple[str, ...], tuple[str, ...]] | None:
+    """Precompile a single unpack of every converted field in a flat struct type, if possible.
+
+    Args:
+        struct_type: C struct, or C struct like, class to inspect.
+        plan: The conversion plan for the struct type.
+
+    Returns:
+        The struct format, names of every unpacked field, names of single character fields, and names of character
+        array fields. None if the type contains fields that must be converted individually, such as nested structs.
+    """
+    if not issubclass(struct_type, ctypes.Structure) or any(entry[1] not in (_SCALAR, _BYTES) for entry in plan):
+        return None
+    try:
+        # Every converted field is a scalar or characters, and skipped "future" fields match the conversion plan.
+        compiled = struct_format(struct_type, skip_future=True)
+    except ValueError:
+        # Bit fields, overlapping fields, and types without a struct module equivalent must be accessed individually.
+        return None
+    field_types = dict(field[:2] for field in struct_type._fields_)  # pylint: disable=protected-access
+    names = tuple(entry[0] for entry in plan)
+    chars = tuple(name for name in names if field_types[name] is ctypes.c_char)
+    strings = tuple(entry[0] for entry in plan if entry[1] == _BYTES and entry[0] not in chars)
+    return compiled, names, chars, strings
+
+
+def _unpacked_field_values(
+    unpacker: tuple[Struct, tuple[str, ...], tuple[str, ...], tuple[str, ...]],
+) -> tuple[list[str], list[str]]:
+    """Generate the value expressions for every field of a flat struct unpacked in a single call.
+
+    Args:
+        unpacker: The struct format, names of every unpacked field, names of single character fields, and names of
+            character array fields, as returned by _build_struct_unpacker.
+
+    Returns:
+        The name of every field, and the expression to convert each unpacked value, in order.
+    """
+    _, names, chars, strings = unpacker
+    values = []
+    for index, field_name in enumerate(names):
+        value = f"values[{index}]"
+        if field_name in chars:
+            value = f'{value}.decode(errors="ignore")'
+        elif field_name in strings:
+            # Match ctypes character arrays, which end at the first null character.
+            value = f'{value}.split(b"\\0", 1)[0].decode(errors="ignore")'
+        values.append(value)
+    return list(names), values
+
+
+def _attribute_access(target: str, name: str) -> str:
+    """Generate the expression to access an attribute by name, even if the name is not valid Python syntax.
+
+    Args:
+        target: Expression of the object containing the attribute.
+        name: Name of the attribute.
+
+    Returns:
+        Direct attribute access if the name is a valid identifier and not a keyword, otherwise a getattr call.
+    """
+    if name.isidentifier() and not keyword.iskeyword(name):
+        return f"{target}.{name}"
+    return f"getattr({target}, {name!r})"
+
+
+def _accessed_field_values(
+    plan: tuple[tuple[str, int, str | None, type | None], ...],
+    namespace: dict,
+    as_tuple: bool,
+) -> tuple[list[str], list[str]]:
+    """Generate the value expressions for every field of a struct accessed individually.
+
+    Args:
+        plan: The conversion plan for the struct type.
+        namespace: Globals of the generated function, updated with the converters for nested structs.
+        as_tuple: Whether to convert into named tuples instead of dictionaries.
+
+    Returns:
+        The name of every field, and the expression to convert each field, in order.
+    """
+    names = []
+    values = []
+    for index, (field_name, kind, limiter, nested_type) in enumerate(plan):
+        field = _attribute_access("struct", field_name)
+        if limiter:
+            field = f"{field}[: {_attribute_access('struct', limiter)}]"
+        if nested_type is not None:
+            # Nested C structs always match their declared type, so their converter can be bound directly.
+            converter = f"_convert_{index}"
+            namespace[converter] = _get_struct_converter(nested_type, as_tuple)
+        if kind == _SCALAR:
+            value = field
+        elif kind == _STRUCT:
+            value = f"{converter}({field})"
+        elif kind == _BYTES:
+            value = f'{field}.decode(errors="ignore")'
+        elif kind == _OPTIONAL_BYTES:
+            value = f'(value.decode(errors="ignore") if (value := {field}) is not None else None)'
+        elif kind == _STRUCT_ARRAY:
+            value = f"[{converter}(sub_data) for sub_data in {field}]"
+            value = f"tuple({value})" if as_tuple else value
+        else:
+            value = f"tuple({field})" if as_tuple else f"list({field})"
+        names.append(field_name)
+        values.append(value)
+    return names, values
+
+
+def _build_struct_converter(struct_type: type, as_tuple: bool = False) -> Callable[[ctypes.Structure], dict | tuple]:
+    """Generate a function specialized to convert a single struct type into a dictionary or named tuple.
+
+    The generated function accesses every field directly, without looping over the fields or checking their kinds.
+    Flat structs are unpacked in a single call, instead of creating every value through the ctypes descriptors.
+
+    Args:
+        struct_type: C struct, or C struct like, class to generate a converter for.
+        as_tuple: Whether to convert into a named tuple instead of a dictionary.
+
+    Returns:
+        Function accepting a single struct of the type, and returning the converted struct.
+    """
+    plan = _build_struct_plan(struct_type)
+    namespace = {}
+    unpacker = _build_struct_unpacker(struct_type, plan)
+    if unpacker is not None:
+        namespace["_unpack_from"] = unpacker[0].unpack_from
+        names, values = _unpacked_field_values(unpacker)
+        body = ["values = _unpack_from(struct)"]
+    else:
+        names, values = _accessed_field_values(plan, namespace, as_tuple)
+        body = []
+
+    if as_tuple:
+        namespace["_tuple_type"] = collections.namedtuple(struct_type.__name__, names)
+        body.append(f"return _tuple_type({', '.join(values)})")
+    else:
+        body.append(f"return {{{', '.join(f'{name!r}: {value}' for name, value in zip(names, values))}}}")
+    source = "def convert(struct):\n" + "".join(f"    {line}\n" for line in body)
+    filename = f"<{'struct_to_namedtuple' if as_tuple else 'struct_to_dict'} {struct_type.__qualname__}>"
+    exec(compile(source, filename, "exec"), namespace)  # pylint: disable=exec-used
+    return namespace["convert"]
+
+
+def _get_struct_converter(struct_type: type, as_tuple: bool = False) -> Callable[[ctypes.Structure], dict | tuple]:
+    """Get the generated converter for a struct type, generating it on first use.
+
+    Args:
+        struct_type: C struct, or C struct like, class to get a converter for.
+        as_tuple: Whether to convert into a named tuple instead of a dictionary.
+
+    Returns:
+        Function accepting a single struct of the type, and returning the converted struct.
+    """
+    converters = _TUPLE_CONVERTERS if as_tuple else _STRUCT_CONVERTERS
+    converter = converters.get(struct_type)
+    if converter is None:
+        converter = converters[struct_type] = _build_struct_converter(struct_type, as_tuple)
+    return converter
+
+
 def struct_to_dict(struct: ctypes.Structure) -> dict:
     """Convert C struct, and all nested structs, into a Python dictionary.
 
@@ -302,26 +788,31 @@ def struct_to_dict(struct: ctypes.Structure) -> dict:
     Returns:
         C struct converted into a dictionary using the names of the struct's fields as keys.
     """
-    struct_dict = {}
-    for field in struct._fields_:  # pylint: disable=protected-access
-        field_name = field[0]
-        field_data = getattr(struct, field_name)
-        if isinstance(field_data, ctypes.Structure):
-            struct_dict[field_name] = struct_to_dict(field_data)
-        elif "future" not in field_name:
-            if isinstance(field_data, ctypes.Array):
-                struct_dict[field_name] = []
-                limiters = getattr(struct, "fields_limiters", {})
-                limiter = limiters.get(field_name)
-                if limiter:
-                    field_data = field_data[: getattr(struct, limiter)]
-                for sub_data in field_data:
-                    if isinstance(sub_data, ctypes.Structure):
-                        struct_dict[field_name].append(struct_to_dict(sub_data))
-                    else:
-                        struct_dict[field_name].append(sub_data)
-            elif isinstance(field_data, bytes):
-                struct_dict[field_name] = field_data.decode(errors="ignore")
-            else:
-                struct_dict[field_name] = field_data
-    return struct_dict
+    converter = _STRUCT_CONVERTERS.get(type(struct))
+    if converter is None:
+        converter = _get_struct_converter(type(struct))
+    return converter(struct)
+
+
+def struct_to_namedtuple(struct: ctypes.Structure) -> tuple:
+    """Convert C struct, and all nested structs, into a Python named tuple.
+
+    Values are copied out of the struct once, and are plain Python objects afterwards. This avoids the overhead of
+    ctypes descriptors when repeatedly accessing fields, such as when processing many TStats in Python.
+    Arrays are converted into tuples, so the result is immutable and hashable. This allows using the result as a
+    cache key, such as with functools.lru_cache, for derived statistics.
+    Skips any "future" named fields since they are empty placeholders for potential future versions.
+
+    Args:
+        struct: C struct loaded from raw Atop file.
+
+    Returns:
+        C struct converted into a named tuple using the names of the struct's fields as attributes.
+
+    Raises:
+        ValueError if a field name cannot be used as a named tuple attribute, such as keywords or leading underscores.
+    """
+    converter = _TUPLE_CONVERTERS.get(type(struct))
+    if converter is None:
+        converter = _get_struct_converter(type(struct), as_tuple=True)
+    return converter(struct)
@@ -1,5 +1,6 @@
 """Global fixtures for pytest."""
 
+import os
 from typing import Callable
 
 import pytest
@@ -64,3 +65,24 @@ def pytest_generate_tests(metafunc: pytest.Metafunc) -> None:
         kwargs = mark.kwargs
         kwargs["ids"] = [str(value) for value in (list(test_case.keys()) if isinstance(test_case, dict) else test_case)]
         metafunc.parametrize(*args, **kwargs)
+
+
+def _test_log(item: pytest.Item) -> str | None:
+    """Find the Atop log used by a parametrized test, from either a log name or the first argument of a test case."""
+    callspec = getattr(item, "callspec", None)
+    if callspec is None:
+        return None
+    for value in callspec.params.values():
+        if isinstance(value, dict):
+            value = next(iter(value.get("args", [])), None)
+        if isinstance(value, str) and value.endswith(".log.gz"):
+            return os.path.basename(value)
+    return None
+
+
+def pytest_collection_modifyitems(items: list[pytest.Item]) -> None:
+    """Group tests by the Atop log they read, so parallel workers only decompress the logs for their own tests."""
+    for item in items:
+        log = _test_log(item)
+        if log:
+            item.add_marker(pytest.mark.xdist_group(name=log))